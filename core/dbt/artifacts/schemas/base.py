@@ -7,8 +7,9 @@ from mashumaro.jsonschema import build_json_schema
 from mashumaro.jsonschema.dialects import DRAFT_2020_12
 
 from dbt.artifacts.exceptions import IncompatibleSchemaError
+from dbt.utils import write_json
 from dbt.version import __version__
-from dbt_common.clients.system import read_json, write_json
+from dbt_common.clients.system import read_json
 from dbt_common.dataclass_schema import dbtClassMixin
 from dbt_common.events.functions import get_metadata_vars
 from dbt_common.exceptions import DbtInternalError, DbtRuntimeError
@@ -25,7 +25,7 @@ from dbt.artifacts.schemas.results import (
     RunStatus,
 )
 from dbt.exceptions import scrub_secrets
-from dbt_common.clients.system import write_json
+from dbt.utils import write_json
 from dbt_common.constants import SECRET_ENV_PREFIX
 
 
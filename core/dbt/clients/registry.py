@@ -15,10 +15,9 @@ from dbt.events.types import (
     RegistryResponseMissingTopKeys,
     RegistryResponseUnexpectedType,
 )
-from dbt.utils import memoized
+from dbt.utils import connection_exception_retry, memoized
 from dbt_common import semver
 from dbt_common.events.functions import fire_event
-from dbt_common.utils.connection import connection_exception_retry
 
 if os.getenv("DBT_PACKAGE_HUB_URL"):
     DEFAULT_REGISTRY_BASE_URL = os.getenv("DBT_PACKAGE_HUB_URL")
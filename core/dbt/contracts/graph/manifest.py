@@ -1,4 +1,5 @@
 import enum
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field, replace
 from itertools import chain
@@ -78,6 +79,7 @@ from dbt.node_types import (
     AccessType,
     NodeType,
 )
+from dbt.utils import memoized
 from dbt_common.dataclass_schema import dbtClassMixin
 from dbt_common.events.contextvars import get_node_info
 from dbt_common.events.functions import fire_event
@@ -607,6 +609,19 @@ def _get_locality(macro: Macro, root_project_name: str, internal_packages: Set[s
         return Locality.Imported
 
 
+@memoized
+def _materialization_macro_name(materialization_name: str, adapter_type: str) -> str:
+    # Interned, like the keys of Manifest._macros_by_name, so that looking the
+    # name up there compares strings by identity.
+    return sys.intern(
+        dbt_common.utils.get_materialization_macro_name(
+            materialization_name=materialization_name,
+            adapter_type=adapter_type,
+            with_prefix=False,
+        )
+    )
+
+
 class Searchable(Protocol):
     resource_type: NodeType
     package_name: str
@@ -755,10 +770,11 @@ class MacroMethods:
         # not necessarily unique, the dict value is a list.
         macros_by_name: Dict[str, List[Macro]] = {}
         for macro in macros.values():
-            if macro.name not in macros_by_name:
-                macros_by_name[macro.name] = []
+            name = sys.intern(macro.name)
+            if name not in macros_by_name:
+                macros_by_name[name] = []
 
-            macros_by_name[macro.name].append(macro)
+            macros_by_name[name].append(macro)
 
         return macros_by_name
 
@@ -927,11 +943,7 @@ class Manifest(MacroMethods, dbtClassMixin):
         adapter_type: str,
         specificity: int,
     ) -> CandidateList:
-        full_name = dbt_common.utils.get_materialization_macro_name(
-            materialization_name=materialization_name,
-            adapter_type=adapter_type,
-            with_prefix=False,
-        )
+        full_name = _materialization_macro_name(materialization_name, adapter_type)
         return CandidateList(
             MaterializationCandidate.from_macro(m, specificity)
             for m in self._find_macros_by_name(full_name, project_name)
@@ -1509,10 +1521,11 @@ class Manifest(MacroMethods, dbtClassMixin):
         if self._macros_by_name is None:
             self._macros_by_name = self._build_macros_by_name(self.macros)
 
-        if macro.name not in self._macros_by_name:
-            self._macros_by_name[macro.name] = []
+        name = sys.intern(macro.name)
+        if name not in self._macros_by_name:
+            self._macros_by_name[name] = []
 
-        self._macros_by_name[macro.name].append(macro)
+        self._macros_by_name[name].append(macro)
 
         if self._macros_by_package is None:
             self._macros_by_package = self._build_macros_by_package(self.macros)
@@ -8,9 +8,9 @@ from typing import Dict, Generic, List, Optional, TypeVar
 
 from dbt.contracts.project import ProjectPackageMetadata
 from dbt.events.types import DepsSetDownloadDirectory
+from dbt.utils import connection_exception_retry
 from dbt_common.clients import system
 from dbt_common.events.functions import fire_event
-from dbt_common.utils.connection import connection_exception_retry
 
 DOWNLOADS_PATH = None
 
@@ -8,9 +8,9 @@ from dbt.contracts.project import TarballPackage
 from dbt.deps.base import PinnedPackage, UnpinnedPackage, get_downloads_path
 from dbt.events.types import DepsScrubbedPackageName
 from dbt.exceptions import DependencyError, env_secrets, scrub_secrets
+from dbt.utils import connection_exception_retry
 from dbt_common.clients import system
 from dbt_common.events.functions import warn_or_error
-from dbt_common.utils.connection import connection_exception_retry
 
 
 class TarballPackageMixin:
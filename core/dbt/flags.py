@@ -1,16 +1,28 @@
 # Do not import the os package because we expose this package in jinja
 from argparse import Namespace
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
 # this roughly follows the patten of EVENT_MANAGER in dbt/common/events/functions.py
 # During de-globlization, we'll need to handle both similarly
 # Match USE_COLORS default with default in dbt.cli.params.use_colors for use in --version
 GLOBAL_FLAGS = Namespace(USE_COLORS=True)  # type: ignore
 
+# The flags object get_flag_dict() last built its result from, and that result.
+_FLAG_DICT_CACHE: Optional[Tuple[Any, Dict[str, Any]]] = None
+
+
+def _is_frozen(obj: Any) -> bool:
+    # Flags is a frozen dataclass, so values derived from one stay valid for as
+    # long as it does. Anything else (e.g. a Namespace in tests) may be mutated.
+    params = getattr(type(obj), "__dataclass_params__", None)
+    return params is not None and params.frozen
+
 
 def set_flags(flags):
-    global GLOBAL_FLAGS
+    global GLOBAL_FLAGS, _FLAG_DICT_CACHE
     GLOBAL_FLAGS = flags
+    _FLAG_DICT_CACHE = None
 
 
 def get_flags():
@@ -18,7 +30,7 @@ def get_flags():
 
 
 def set_from_args(args: Namespace, project_flags):
-    global GLOBAL_FLAGS
+    global GLOBAL_FLAGS, _FLAG_DICT_CACHE
     from dbt.cli.flags import Flags, convert_config
     from dbt.cli.main import cli
 
@@ -41,9 +53,17 @@ def set_from_args(args: Namespace, project_flags):
         object.__setattr__(flags, arg_name.lower(), args_param_value)
     flags.set_common_global_flags()
     GLOBAL_FLAGS = flags  # type: ignore
+    _FLAG_DICT_CACHE = None
 
 
 def get_flag_dict():
+    """Return the global flags as a dict. The result is shared between calls
+    for as long as the global flags are unchanged, so don't mutate it.
+    """
+    global _FLAG_DICT_CACHE
+    if _FLAG_DICT_CACHE is not None and _FLAG_DICT_CACHE[0] is GLOBAL_FLAGS:
+        return _FLAG_DICT_CACHE[1]
+
     flag_attr = {
         "use_experimental_parser",
         "static_parser",
@@ -69,7 +89,10 @@ def get_flag_dict():
         "log_path",
         "invocation_command",
     }
-    return {key: getattr(GLOBAL_FLAGS, key.upper(), None) for key in flag_attr}
+    flag_dict = {key: getattr(GLOBAL_FLAGS, key.upper(), None) for key in flag_attr}
+    if _is_frozen(GLOBAL_FLAGS):
+        _FLAG_DICT_CACHE = (GLOBAL_FLAGS, flag_dict)
+    return flag_dict
 
 
 # This is used by core/dbt/context/base.py to return a flag object
@@ -1,23 +1,23 @@
-import collections
 import datetime
 import decimal
 import functools
-import itertools
 import json
 import os
+import random
 import sys
+import time
 from enum import Enum
 from pathlib import PosixPath, WindowsPath
+from tarfile import ReadError
 from typing import (
-    AbstractSet,
     Any,
+    Callable,
     Dict,
     Iterable,
     Iterator,
     List,
     Mapping,
     Optional,
-    Sequence,
     Set,
     Tuple,
     Type,
@@ -27,17 +27,21 @@ import jinja2
 
 from dbt import flags
 from dbt.exceptions import DuplicateAliasError
-from dbt_common.exceptions import RecursionError
+from dbt_common.events.functions import fire_event
+from dbt_common.events.types import RecordRetryException, RetryExternalCall
+from dbt_common.exceptions import ConnectionError, RecursionError
 from dbt_common.helper_types import WarnErrorOptions
 from dbt_common.utils import md5
 
-DECIMALS: Tuple[Type[Any], ...]
+# cdecimal was merged into the standard library's decimal in Python 3.3
+DECIMALS: Type[decimal.Decimal] = decimal.Decimal
+
+# orjson is an optional dependency (`pip install dbt-core[orjson]`). It is
+# much faster than the json module at serializing large artifacts.
 try:
-    import cdecimal  # typing: ignore
+    import orjson
 except ImportError:
-    DECIMALS = (decimal.Decimal,)
-else:
-    DECIMALS = (decimal.Decimal, cdecimal.Decimal)
+    orjson = None  # type: ignore
 
 
 class ExitCodes(int, Enum):
@@ -59,39 +63,50 @@ def get_profile_from_project(project):
     return profile
 
 
-def get_model_name_or_none(model):
-    if model is None:
-        name = "<None>"
+# Name lookups for the exact types get_model_name_or_none sees most often, so
+# the common cases cost one dict lookup rather than a chain of type checks.
+_MODEL_NAME_GETTERS: Dict[type, Callable[[Any], Any]] = {
+    type(None): lambda model: "<None>",
+    str: lambda model: model,
+    dict: lambda model: model.get("alias", model.get("name")),
+}
+
+_MISSING = object()
 
-    elif isinstance(model, str):
-        name = model
+
+def get_model_name_or_none(model: Any) -> Any:
+    getter = _MODEL_NAME_GETTERS.get(type(model))
+    if getter is not None:
+        return getter(model)
     elif isinstance(model, dict):
-        name = model.get("alias", model.get("name"))
-    elif hasattr(model, "alias"):
-        name = model.alias
-    elif hasattr(model, "name"):
-        name = model.name
-    else:
+        return _MODEL_NAME_GETTERS[dict](model)
+
+    name = getattr(model, "alias", _MISSING)
+    if name is _MISSING:
+        name = getattr(model, "name", _MISSING)
+    if name is _MISSING:
         name = str(model)
     return name
 
 
-def split_path(path):
-    return path.split(os.sep)
+_SEP = os.sep
+
+
+def split_path(path: str) -> List[str]:
+    return path.split(_SEP)
 
 
-def get_pseudo_test_path(node_name, source_path):
+def get_pseudo_test_path(node_name: str, source_path: str) -> str:
     "schema tests all come from schema.yml files. fake a source sql file"
-    source_path_parts = split_path(source_path)
-    source_path_parts.pop()  # ignore filename
-    suffix = ["{}.sql".format(node_name)]
-    pseudo_path_parts = source_path_parts + suffix
-    return os.path.join(*pseudo_path_parts)
+    # replace the filename
+    idx = source_path.rfind(_SEP)
+    if idx < 0:
+        return f"{node_name}.sql"
+    return f"{source_path[:idx]}{_SEP}{node_name}.sql"
 
 
-def get_pseudo_hook_path(hook_name):
-    path_parts = ["hooks", "{}.sql".format(hook_name)]
-    return os.path.join(*path_parts)
+def get_pseudo_hook_path(hook_name: str) -> str:
+    return f"hooks{_SEP}{hook_name}.sql"
 
 
 def get_hash(model):
@@ -102,58 +117,106 @@ def get_hashed_contents(model):
     return md5(model.raw_code)
 
 
-def flatten_nodes(dep_list):
-    return list(itertools.chain.from_iterable(dep_list))
+def flatten_nodes(dep_list: Iterable[Iterable[Any]]) -> List[Any]:
+    # list.extend per sublist measures ~2x faster than chain.from_iterable
+    result: List[Any] = []
+    extend = result.extend
+    for nodes in dep_list:
+        extend(nodes)
+    return result
 
 
-class memoized:
-    """Decorator. Caches a function's return value each time it is called. If
-    called later with the same arguments, the cached value is returned (not
-    reevaluated).
+# Default cap on the number of entries in a `memoized` cache. Callers get LRU
+# eviction: recently used entries are the ones most likely to be asked for
+# again within an invocation, and bounding the cache keeps long-running
+# processes from growing without limit.
+DEFAULT_MEMO_MAXSIZE = 4096
 
-    Taken from https://wiki.python.org/moin/PythonDecoratorLibrary#Memoize"""
 
-    def __init__(self, func) -> None:
-        self.func = func
-        self.cache: Dict[Any, Any] = {}
+def memoized(func=None, *, maxsize: Optional[int] = DEFAULT_MEMO_MAXSIZE):
+    """Decorator. Caches a function's return value each time it is called. If
+    called later with the same arguments, the cached value is returned (not
+    reevaluated). The cache can be reset with `func.cache_clear()`.
 
-    def __call__(self, *args):
-        if not isinstance(args, collections.abc.Hashable):
-            # uncacheable. a list, for instance.
-            # better to not cache than blow up.
-            return self.func(*args)
-        if args in self.cache:
-            return self.cache[args]
-        value = self.func(*args)
-        self.cache[args] = value
-        return value
+    At most `maxsize` results are kept, least recently used first out. Pass
+    `maxsize=None` for an unbounded cache. Can be used bare (`@memoized`) or
+    with arguments (`@memoized(maxsize=128)`).
+    """
 
-    def __repr__(self):
-        """Return the function's docstring."""
-        return self.func.__doc__
+    def decorator(fn):
+        return functools.lru_cache(maxsize=maxsize)(fn)
 
-    def __get__(self, obj, objtype):
-        """Support instance methods."""
-        return functools.partial(self.__call__, obj)
+    if func is None:
+        return decorator
+    return decorator(func)
 
 
 def add_ephemeral_model_prefix(s: str) -> str:
     return "__dbt__cte__{}".format(s)
 
 
+_UTC = datetime.timezone.utc
+# Bound to the class rather than to its `now` method so that freezegun, which
+# swaps out module attributes that refer to the datetime class, still works.
+_datetime = datetime.datetime
+
+
 def timestring() -> str:
     """Get the current datetime as an RFC 3339-compliant string"""
-    # isoformat doesn't include the mandatory trailing 'Z' for UTC.
-    return datetime.datetime.utcnow().isoformat() + "Z"
+    # isoformat renders UTC as '+00:00'; swap it for the conventional 'Z'.
+    return _datetime.now(_UTC).isoformat(timespec="microseconds")[:-6] + "Z"
 
 
 def humanize_execution_time(execution_time: int) -> str:
+    if type(execution_time) is int:
+        # whole seconds: no need for the float formatting below
+        hours, remainder = divmod(execution_time, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f" in {hours} hours {minutes} minutes and {seconds}.00 seconds"
+
     minutes, seconds = divmod(execution_time, 60)
     hours, minutes = divmod(minutes, 60)
 
     return f" in {int(hours)} hours {int(minutes)} minutes and {seconds:0.2f} seconds"
 
 
+def _encode_undefined(obj: jinja2.Undefined) -> str:
+    return ""
+
+
+def _encode_to_dict(obj: Any) -> Any:
+    return obj.to_dict(omit_none=True)
+
+
+# Maps the exact type of an object to the function JSONEncoder.default uses
+# to serialize it. Types not listed here are resolved with isinstance checks
+# the first time they are seen and then added, so each type only pays for
+# those checks once.
+_JSON_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    DECIMALS: float,
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+}
+
+
+def _find_json_encoder(obj: Any) -> Optional[Callable[[Any], Any]]:
+    if isinstance(obj, DECIMALS):
+        return float
+    elif isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return type(obj).isoformat
+    elif isinstance(obj, jinja2.Undefined):
+        return _encode_undefined
+    elif isinstance(obj, Exception):
+        return repr
+    elif hasattr(obj, "to_dict"):
+        # if we have a to_dict we should try to serialize the result of
+        # that!
+        return _encode_to_dict
+    else:
+        return None
+
+
 class JSONEncoder(json.JSONEncoder):
     """A 'custom' json encoder that does normal json encoder things, but also
     handles `Decimal`s and `Undefined`s. Decimals can lose precision because
@@ -161,20 +224,55 @@ class JSONEncoder(json.JSONEncoder):
     """
 
     def default(self, obj):
-        if isinstance(obj, DECIMALS):
-            return float(obj)
-        elif isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
-            return obj.isoformat()
-        elif isinstance(obj, jinja2.Undefined):
-            return ""
-        elif isinstance(obj, Exception):
-            return repr(obj)
-        elif hasattr(obj, "to_dict"):
-            # if we have a to_dict we should try to serialize the result of
-            # that!
-            return obj.to_dict(omit_none=True)
-        else:
-            return super().default(obj)
+        encoder = _JSON_ENCODERS.get(type(obj))
+        if encoder is None:
+            encoder = _find_json_encoder(obj)
+            if encoder is None:
+                return super().default(obj)
+            # a to_dict set on the instance rather than the class says
+            # nothing about other objects of the same type
+            if encoder is not _encode_to_dict or hasattr(type(obj), "to_dict"):
+                _JSON_ENCODERS[type(obj)] = encoder
+        return encoder(obj)
+
+
+def _orjson_default(obj):
+    encoder = _JSON_ENCODERS.get(type(obj)) or _find_json_encoder(obj)
+    if encoder is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return encoder(obj)
+
+
+def _json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            # dataclasses are passed through to _orjson_default so that they
+            # are serialized with to_dict(omit_none=True), as JSONEncoder does
+            return orjson.dumps(
+                obj,
+                default=_orjson_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, cls=JSONEncoder)
+
+
+def write_json(path: str, data: Dict[str, Any]) -> bool:
+    """Write data to path as JSON. Like `dbt_common.clients.system.write_json`,
+    handling the same types as `JSONEncoder`, but uses orjson when it is
+    installed. Falls back to the json module if it is not (or if orjson can't
+    handle the value, e.g. an int wider than 64 bits).
+
+    The two paths produce the same value once parsed, but not always the same
+    text: orjson writes non-ASCII characters as UTF-8 rather than \\uXXXX
+    escapes, and writes NaN and infinite floats as null rather than NaN and
+    Infinity (which are not valid JSON).
+    """
+    # imported here because dbt_common.clients.system imports requests
+    from dbt_common.clients.system import write_file
+
+    return write_file(path, _json_dumps(data))
 
 
 class Translator:
@@ -183,33 +281,52 @@ class Translator:
         self.recursive = recursive
 
     def translate_mapping(self, kwargs: Mapping[str, Any]) -> Dict[str, Any]:
-        result: Dict[str, Any] = {}
-
-        for key, value in kwargs.items():
-            canonical_key = self.aliases.get(key, key)
-            if canonical_key in result:
-                raise DuplicateAliasError(kwargs, self.aliases, canonical_key)
-            result[canonical_key] = self.translate_value(value)
+        # Nested values are walked with an explicit stack rather than by
+        # recursion. Each entry asks for container[key] to be translated in
+        # place; an entry with no container marks leaving the value whose id
+        # is the key, so `path` always holds the values being translated.
+        stack: List[Tuple[Any, Any]] = []
+        path: Set[int] = set()
+        result = self._enter(kwargs, stack, path)
+        while stack:
+            container, key = stack.pop()
+            if container is None:
+                path.discard(key)
+            else:
+                container[key] = self._enter(container[key], stack, path)
         return result
 
-    def translate_sequence(self, value: Sequence[Any]) -> List[Any]:
-        return [self.translate_value(v) for v in value]
+    def _enter(self, value: Any, stack: List[Tuple[Any, Any]], path: Set[int]) -> Any:
+        """Shallow-translate a mapping or sequence, and push its nested
+        mappings and sequences onto the stack if this translation is
+        recursive.
+        """
+        if id(value) in path:
+            raise RecursionError("Cycle detected in a value passed to translate!")
+        path.add(id(value))
+        stack.append((None, id(value)))
+
+        result: Any
+        if isinstance(value, Mapping):
+            result = {}
+            for key, item in value.items():
+                canonical_key = self.aliases.get(key, key)
+                if canonical_key in result:
+                    raise DuplicateAliasError(value, self.aliases, canonical_key)
+                result[canonical_key] = item
+            keys: Iterable[Any] = result.keys()
+        else:
+            result = list(value)
+            keys = range(len(result))
 
-    def translate_value(self, value: Any) -> Any:
         if self.recursive:
-            if isinstance(value, Mapping):
-                return self.translate_mapping(value)
-            elif isinstance(value, (list, tuple)):
-                return self.translate_sequence(value)
-        return value
+            for key in keys:
+                if isinstance(result[key], (Mapping, list, tuple)):
+                    stack.append((result, key))
+        return result
 
     def translate(self, value: Mapping[str, Any]) -> Dict[str, Any]:
-        try:
-            return self.translate_mapping(value)
-        except RuntimeError as exc:
-            if "maximum recursion depth exceeded" in str(exc):
-                raise RecursionError("Cycle detected in a value passed to translate!")
-            raise
+        return self.translate_mapping(value)
 
 
 def translate_aliases(
@@ -243,10 +360,12 @@ def coerce_dict_str(value: Any) -> Optional[Dict[str, Any]]:
     easier. You get either `None` if it's not a Dict[str, Any], or the
     Dict[str, Any] you expected (to pass it to dbtClassMixin.from_dict(...)).
     """
-    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
-        return value
-    else:
+    if not isinstance(value, dict):
         return None
+    for key in value:
+        if type(key) is not str and not isinstance(key, str):
+            return None
+    return value
 
 
 def _coerce_decimal(value):
@@ -262,8 +381,10 @@ def fqn_search(root: Dict[str, Any], fqn: List[str]) -> Iterator[Dict[str, Any]]
     yield root
 
     for level in fqn:
-        level_config = root.get(level, None)
-        if not isinstance(level_config, dict):
+        level_config = root.get(level)
+        # the exact-type check is cheap and covers what yaml gives us, so
+        # only fall back to isinstance for anything else
+        if type(level_config) is not dict and not isinstance(level_config, dict):
             break
         # This used to do a 'deepcopy',
         # but it didn't seem to be necessary
@@ -279,11 +400,16 @@ StringMapIter = Iterable[StringMap]
 class MultiDict(Mapping[str, Any]):
     """Implement the mapping protocol using a list of mappings. The most
     recently added mapping "wins".
+
+    The set of keys is built on first use by `__iter__`/`__len__` and reused
+    until another source is added, so sources should not be mutated once
+    added. Lookups walk the sources directly.
     """
 
     def __init__(self, sources: Optional[StringMapList] = None) -> None:
         super().__init__()
         self.sources: StringMapList
+        self._keys: Optional[Set[str]] = None
 
         if sources is None:
             self.sources = []
@@ -292,35 +418,59 @@ class MultiDict(Mapping[str, Any]):
 
     def add_from(self, sources: StringMapIter):
         self.sources.extend(sources)
+        self._keys = None
 
     def add(self, source: StringMap):
         self.sources.append(source)
+        self._keys = None
 
-    def _keyset(self) -> AbstractSet[str]:
-        # return the set of keys
-        keys: Set[str] = set()
-        for entry in self._itersource():
-            keys.update(entry)
-        return keys
-
-    def _itersource(self) -> StringMapIter:
-        return reversed(self.sources)
+    def _keyset(self) -> Set[str]:
+        if self._keys is None:
+            keys: Set[str] = set()
+            for entry in self.sources:
+                keys.update(entry)
+            self._keys = keys
+        return self._keys
 
     def __iter__(self) -> Iterator[str]:
-        # we need to avoid duplicate keys
         return iter(self._keyset())
 
     def __len__(self):
         return len(self._keyset())
 
     def __getitem__(self, name: str) -> Any:
-        for entry in self._itersource():
+        sources = self.sources
+        for i in range(len(sources) - 1, -1, -1):
+            entry = sources[i]
             if name in entry:
                 return entry[name]
         raise KeyError(name)
 
     def __contains__(self, name) -> bool:
-        return any((name in entry for entry in self._itersource()))
+        sources = self.sources
+        for i in range(len(sources) - 1, -1, -1):
+            if name in sources[i]:
+                return True
+        return False
+
+
+# args keys that clutter up the dictionary
+_SKIPPED_ARGS_KEYS = frozenset({"cls", "mp_context"})
+# TODO: add more default_false_keys
+_DEFAULT_FALSE_KEYS = frozenset(
+    {
+        "debug",
+        "full_refresh",
+        "fail_fast",
+        "warn_error",
+        "single_threaded",
+        "log_cache_events",
+        "store_failures",
+        "use_experimental_parser",
+    }
+)
+_DEFAULT_EMPTY_YAML_DICT_KEYS = frozenset({"vars", "warn_error_options"})
+_PATH_TYPES = (PosixPath, WindowsPath)
 
 
 # This is used to serialize the args in the run_results and in the logs.
@@ -328,7 +478,7 @@ class MultiDict(Mapping[str, Any]):
 # i.e. PosixPath, WindowsPath, and types. It also includes args from both
 # cli args and flags, which is more complete than just the cli args.
 # If new args are added that are false by default (particularly in the
-# global options) they should be added to the 'default_false_keys' list.
+# global options) they should be added to the '_DEFAULT_FALSE_KEYS' set.
 def args_to_dict(args):
     var_args = vars(args).copy()
     # update the args with the flags, which could also come from environment
@@ -336,41 +486,70 @@ def args_to_dict(args):
     flag_dict = flags.get_flag_dict()
     var_args.update(flag_dict)
     dict_args = {}
-    # remove args keys that clutter up the dictionary
-    for key in var_args:
-        if key.lower() in var_args and key == key.upper():
+    for key, value in var_args.items():
+        if key.isupper() and key.lower() in var_args:
             # skip all capped keys being introduced by Flags in dbt.cli.flags
             continue
-        if key in ["cls", "mp_context"]:
+        if key in _SKIPPED_ARGS_KEYS:
             continue
-        if var_args[key] is None:
+        if value is None:
             continue
-        # TODO: add more default_false_keys
-        default_false_keys = (
-            "debug",
-            "full_refresh",
-            "fail_fast",
-            "warn_error",
-            "single_threaded",
-            "log_cache_events",
-            "store_failures",
-            "use_experimental_parser",
-        )
-        default_empty_yaml_dict_keys = ("vars", "warn_error_options")
-        if key in default_false_keys and var_args[key] is False:
+        if value is False and key in _DEFAULT_FALSE_KEYS:
             continue
-        if key in default_empty_yaml_dict_keys and var_args[key] == "{}":
+        if key in _DEFAULT_EMPTY_YAML_DICT_KEYS and value == "{}":
             continue
         # this was required for a test case
-        if isinstance(var_args[key], PosixPath) or isinstance(var_args[key], WindowsPath):
-            var_args[key] = str(var_args[key])
-        if isinstance(var_args[key], WarnErrorOptions):
-            var_args[key] = var_args[key].to_dict()
+        if isinstance(value, _PATH_TYPES):
+            value = str(value)
+        elif isinstance(value, WarnErrorOptions):
+            value = value.to_dict()
 
-        dict_args[key] = var_args[key]
+        dict_args[key] = value
     return dict_args
 
 
+# Delay before retry n (counting from 0) is RETRY_BASE_DELAY * 2**n seconds,
+# capped at RETRY_MAX_DELAY, plus up to RETRY_JITTER seconds of random jitter so
+# that concurrent clients don't retry in lockstep.
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.25
+
+# The exceptions connection_exception_retry retries on. Filled in on first use
+# so that importing this module doesn't import requests, which is slow.
+_RETRY_EXCEPTIONS: Optional[Tuple[Type[BaseException], ...]] = None
+
+
+def connection_exception_retry(fn: Callable, max_attempts: int, attempt: int = 0):
+    """Handle connection retries gracefully.
+
+    Attempts to run a function that makes an external call, if the call fails
+    on a Requests exception or decompression issue (ReadError), it will be tried
+    up to `max_attempts` more times, backing off exponentially between tries.
+    All exceptions that Requests explicitly raises inherit from
+    requests.exceptions.RequestException.  See https://github.com/dbt-labs/dbt-core/issues/4579
+    for context on this decompression issues specifically.
+    """
+    global _RETRY_EXCEPTIONS
+    if _RETRY_EXCEPTIONS is None:
+        import requests
+
+        _RETRY_EXCEPTIONS = (requests.exceptions.RequestException, ReadError, EOFError)
+    retry_exceptions = _RETRY_EXCEPTIONS
+
+    while True:
+        try:
+            return fn()
+        except retry_exceptions as exc:
+            if attempt >= max_attempts:
+                raise ConnectionError("External connection exception occurred: " + str(exc))
+            fire_event(RecordRetryException(exc=str(exc)))
+            fire_event(RetryExternalCall(attempt=attempt, max=max_attempts))
+            delay = min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY)
+            time.sleep(delay + random.uniform(0, RETRY_JITTER))
+            attempt += 1
+
+
 # Taken from https://github.com/python/cpython/blob/3.11/Lib/distutils/util.py
 # This is a copy of the function from distutils.util, which was removed in Python 3.12.
 def strtobool(val: str) -> bool:
@@ -82,6 +82,9 @@ setup(
         "typing-extensions>=4.4",
         # ----
     ],
+    extras_require={
+        "orjson": ["orjson>=3.9,<4"],
+    },
     zip_safe=False,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
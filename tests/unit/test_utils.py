@@ -1,7 +1,22 @@
+import datetime
+import decimal
+import json
+import os
+import tempfile
 import unittest
+from argparse import Namespace
+from dataclasses import dataclass
+from unittest import mock
+
+import jinja2
+from freezegun import freeze_time
 
 import dbt.exceptions
+import dbt.flags
 import dbt.utils
+import dbt_common.exceptions
+from dbt.artifacts.schemas.results import TimingInfo
+from dbt.artifacts.schemas.run import RunResultsArtifact
 
 
 class TestMultiDict(unittest.TestCase):
@@ -42,6 +57,21 @@ class TestMultiDict(unittest.TestCase):
         assert md["d"] == 2
         assert md["e"] == 3
 
+    def test_add_after_lookup(self):
+        md = dbt.utils.MultiDict([{"a": 1, "b": 2}])
+        assert md["a"] == 1
+        assert len(md) == 2
+        md.add({"a": 3, "c": 4})
+        assert md["a"] == 3
+        assert "c" in md
+        assert len(md) == 3
+        md.add_from([{"d": 5}, {"c": 6}])
+        assert md["c"] == 6
+        assert set(md) == {"a", "b", "c", "d"}
+        assert "e" not in md
+        with self.assertRaises(KeyError):
+            md["e"]
+
 
 class TestHumanizeExecutionTime(unittest.TestCase):
     def test_humanzing_execution_time_with_integer(self):
@@ -50,6 +80,12 @@ class TestHumanizeExecutionTime(unittest.TestCase):
 
         assert result == " in 2 hours 37 minutes and 40.00 seconds"
 
+    def test_humanzing_execution_time_with_integral_float(self):
+
+        result = dbt.utils.humanize_execution_time(execution_time=9460.0)
+
+        assert result == " in 2 hours 37 minutes and 40.00 seconds"
+
     def test_humanzing_execution_time_with_two_decimal_place_float(self):
 
         result = dbt.utils.humanize_execution_time(execution_time=0.32)
@@ -61,3 +97,311 @@ class TestHumanizeExecutionTime(unittest.TestCase):
         result = dbt.utils.humanize_execution_time(execution_time=0.3254)
 
         assert result == " in 0 hours 0 minutes and 0.33 seconds"
+
+
+class TestMemoized(unittest.TestCase):
+    def test_memoized_function(self):
+        calls = []
+
+        @dbt.utils.memoized
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        assert double(2) == 4
+        assert double(2) == 4
+        assert calls == [2]
+        double.cache_clear()
+        assert double(2) == 4
+        assert calls == [2, 2]
+
+    def test_memoized_maxsize(self):
+        calls = []
+
+        @dbt.utils.memoized(maxsize=1)
+        def double(x):
+            calls.append(x)
+            return x * 2
+
+        double(1)
+        double(2)
+        double(1)
+        assert calls == [1, 2, 1]
+        assert double.cache_info().maxsize == 1
+
+
+class TestConnectionExceptionRetry(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def _fails_n_times(self, n):
+        def fn():
+            self.calls += 1
+            if self.calls <= n:
+                raise EOFError("boom")
+            return "ok"
+
+        return fn
+
+    @mock.patch("dbt.utils.time.sleep")
+    def test_retries_until_success(self, sleep):
+        result = dbt.utils.connection_exception_retry(self._fails_n_times(3), 5)
+        assert result == "ok"
+        assert self.calls == 4
+        assert sleep.call_count == 3
+        delays = [call.args[0] for call in sleep.call_args_list]
+        assert delays == sorted(delays)
+
+    @mock.patch("dbt.utils.time.sleep")
+    def test_raises_after_max_attempts(self, sleep):
+        with self.assertRaises(dbt_common.exceptions.ConnectionError):
+            dbt.utils.connection_exception_retry(self._fails_n_times(100), 5)
+        assert self.calls == 6
+        assert sleep.call_count == 5
+
+
+class TestGetModelNameOrNone(unittest.TestCase):
+    def test_get_model_name_or_none(self):
+        class Aliased:
+            alias = "aliased"
+            name = "named"
+
+        class Named:
+            name = "named"
+
+        get_name = dbt.utils.get_model_name_or_none
+        assert get_name(None) == "<None>"
+        assert get_name("model") == "model"
+        assert get_name({"alias": "aliased", "name": "named"}) == "aliased"
+        assert get_name({"name": "named"}) == "named"
+        assert get_name(Aliased()) == "aliased"
+        assert get_name(Named()) == "named"
+        assert get_name(1) == "1"
+
+
+class TestTimestring(unittest.TestCase):
+    def test_timestring(self):
+        result = dbt.utils.timestring()
+        assert result.endswith("Z")
+        parsed = datetime.datetime.strptime(result, "%Y-%m-%dT%H:%M:%S.%fZ")
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        assert abs((now - parsed).total_seconds()) < 60
+
+    @freeze_time("2024-01-02 03:04:05")
+    def test_timestring_frozen(self):
+        assert dbt.utils.timestring() == "2024-01-02T03:04:05.000000Z"
+
+
+class TestJSONEncoder(unittest.TestCase):
+    def test_encodes_special_types(self):
+        class WithToDict:
+            def to_dict(self, omit_none=False):
+                return {"omit_none": omit_none}
+
+        value = {
+            "decimal": decimal.Decimal("1.5"),
+            "datetime": datetime.datetime(2024, 1, 2, 3, 4, 5),
+            "date": datetime.date(2024, 1, 2),
+            "time": datetime.time(3, 4, 5),
+            "undefined": jinja2.Undefined(),
+            "exception": ValueError("oops"),
+            "to_dict": WithToDict(),
+        }
+        expected = {
+            "decimal": 1.5,
+            "datetime": "2024-01-02T03:04:05",
+            "date": "2024-01-02",
+            "time": "03:04:05",
+            "undefined": "",
+            "exception": "ValueError('oops')",
+            "to_dict": {"omit_none": True},
+        }
+        # encode twice so both the lookup and the cached path are exercised
+        for _ in range(2):
+            assert json.loads(json.dumps(value, cls=dbt.utils.JSONEncoder)) == expected
+
+    def test_unknown_type_raises(self):
+        with self.assertRaises(TypeError):
+            json.dumps({"a": object()}, cls=dbt.utils.JSONEncoder)
+
+
+class TestWriteJson(unittest.TestCase):
+    value = {
+        "decimal": decimal.Decimal("1.5"),
+        "datetime": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "undefined": jinja2.Undefined(),
+        "nested": {1: ["a", None, True]},
+    }
+    expected = {
+        "decimal": 1.5,
+        "datetime": "2024-01-02T03:04:05",
+        "undefined": "",
+        "nested": {"1": ["a", None, True]},
+    }
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "out.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_and_load(self, data):
+        dbt.utils.write_json(self.path, data)
+        with open(self.path, encoding="utf-8") as fp:
+            return json.load(fp)
+
+    def test_write_json(self):
+        assert dbt.utils.orjson is not None
+        assert self._write_and_load(self.value) == self.expected
+
+    def test_write_json_without_orjson(self):
+        with mock.patch("dbt.utils.orjson", None):
+            assert self._write_and_load(self.value) == self.expected
+
+    def test_write_json_artifact_matches_without_orjson(self):
+        artifact = RunResultsArtifact.from_execution_results(
+            results=[],
+            elapsed_time=1.5,
+            generated_at=datetime.datetime(2024, 1, 2, 3, 4, 5),
+            args={
+                "vars": {"greeting": "h\u00e9llo"},
+                "invocation_command": "dbt run",
+                "timing": TimingInfo(name="x"),
+            },
+        )
+        data = artifact.to_dict(omit_none=False)
+        result = self._write_and_load(data)
+        with mock.patch("dbt.utils.orjson", None):
+            assert self._write_and_load(data) == result
+        assert result["args"]["timing"] == {"name": "x"}
+
+    def test_write_json_unknown_type_raises(self):
+        with self.assertRaises(TypeError):
+            dbt.utils.write_json(self.path, {"a": object()})
+
+
+class TestPseudoPaths(unittest.TestCase):
+    def test_get_pseudo_test_path(self):
+        source_path = os.path.join("models", "staging", "schema.yml")
+        assert dbt.utils.get_pseudo_test_path("my_test", source_path) == os.path.join(
+            "models", "staging", "my_test.sql"
+        )
+        assert dbt.utils.get_pseudo_test_path("my_test", "schema.yml") == "my_test.sql"
+
+    def test_get_pseudo_hook_path(self):
+        assert dbt.utils.get_pseudo_hook_path("on-run-start-0") == os.path.join(
+            "hooks", "on-run-start-0.sql"
+        )
+
+
+class TestFqnSearch(unittest.TestCase):
+    def test_fqn_search(self):
+        leaf = {"+enabled": False}
+        middle = {"leaf": leaf, "+tags": ["a"]}
+        root = {"middle": middle}
+        assert list(dbt.utils.fqn_search(root, ["middle", "leaf", "model"])) == [
+            root,
+            middle,
+            leaf,
+        ]
+        assert list(dbt.utils.fqn_search(root, ["other", "leaf"])) == [root]
+
+
+class TestTranslateAliases(unittest.TestCase):
+    aliases = {"pass": "password", "user": "username"}
+
+    def test_translate_flat(self):
+        nested = {"pass": "x"}
+        result = dbt.utils.translate_aliases({"user": "a", "nested": nested}, self.aliases)
+        assert result == {"username": "a", "nested": {"pass": "x"}}
+        assert result["nested"] is nested
+
+    def test_translate_recursive(self):
+        kwargs = {
+            "user": "a",
+            "nested": {"pass": "x", "items": [{"user": "b"}, ({"pass": "y"},)]},
+        }
+        result = dbt.utils.translate_aliases(kwargs, self.aliases, recurse=True)
+        assert result == {
+            "username": "a",
+            "nested": {"password": "x", "items": [{"username": "b"}, [{"password": "y"}]]},
+        }
+
+    def test_duplicate_alias(self):
+        with self.assertRaises(dbt.exceptions.DuplicateAliasError):
+            dbt.utils.translate_aliases({"user": "a", "username": "b"}, self.aliases)
+        with self.assertRaises(dbt.exceptions.DuplicateAliasError):
+            dbt.utils.translate_aliases(
+                {"nested": {"pass": "a", "password": "b"}}, self.aliases, recurse=True
+            )
+
+    def test_shared_value_is_not_a_cycle(self):
+        shared = {"user": "a"}
+        result = dbt.utils.translate_aliases(
+            {"first": shared, "second": [shared, shared]}, self.aliases, recurse=True
+        )
+        assert result == {
+            "first": {"username": "a"},
+            "second": [{"username": "a"}, {"username": "a"}],
+        }
+
+    def test_cycle(self):
+        kwargs = {"user": "a", "nested": {}}
+        kwargs["nested"]["loop"] = [kwargs]
+        with self.assertRaises(dbt_common.exceptions.RecursionError):
+            dbt.utils.translate_aliases(kwargs, self.aliases, recurse=True)
+
+    def test_deeply_nested(self):
+        kwargs = {"user": "a"}
+        for _ in range(5000):
+            kwargs = {"nested": kwargs}
+        result = dbt.utils.translate_aliases(kwargs, self.aliases, recurse=True)
+        for _ in range(5000):
+            result = result["nested"]
+        assert result == {"username": "a"}
+
+
+class TestFlattenNodes(unittest.TestCase):
+    def test_flatten_nodes(self):
+        assert dbt.utils.flatten_nodes([["a", "b"], [], ("c",), ["d"]]) == ["a", "b", "c", "d"]
+        assert dbt.utils.flatten_nodes([]) == []
+
+
+class TestCoerceDictStr(unittest.TestCase):
+    def test_coerce_dict_str(self):
+        class Key(str):
+            pass
+
+        value = {"a": 1, Key("b"): 2}
+        assert dbt.utils.coerce_dict_str(value) is value
+        assert dbt.utils.coerce_dict_str({}) == {}
+        assert dbt.utils.coerce_dict_str({"a": 1, 2: 3}) is None
+        assert dbt.utils.coerce_dict_str(["a"]) is None
+        assert dbt.utils.coerce_dict_str(None) is None
+
+
+@dataclass(frozen=True)
+class FrozenFlags:
+    DEBUG: bool = False
+
+
+class TestArgsToDict(unittest.TestCase):
+    def setUp(self):
+        self.original_flags = dbt.flags.get_flags()
+        dbt.flags.set_flags(FrozenFlags())
+
+    def tearDown(self):
+        dbt.flags.set_flags(self.original_flags)
+
+    def test_args_to_dict(self):
+        result = dbt.utils.args_to_dict(Namespace(which="run", select=None, mp_context="x"))
+        assert result["which"] == "run"
+        assert "select" not in result
+        assert "mp_context" not in result
+        assert "debug" not in result
+
+    def test_flag_dict_cache_follows_global_flags(self):
+        assert dbt.flags.get_flag_dict() is dbt.flags.get_flag_dict()
+        dbt.flags.set_flags(FrozenFlags(DEBUG=True))
+        assert dbt.flags.get_flag_dict()["debug"] is True